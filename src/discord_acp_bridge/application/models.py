@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 
 
 @dataclass(frozen=True)
@@ -33,7 +33,7 @@ class PermissionRequest:
     acp_session_id: str
     thread_id: int
     tool_call: ToolCallInfo
-    options: list[PermissionOptionInfo] = field(default_factory=list)
+    options: tuple[PermissionOptionInfo, ...] = ()
 
 
 @dataclass
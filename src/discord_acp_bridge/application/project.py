@@ -2,14 +2,19 @@
 
 from __future__ import annotations
 
+import bisect
 import fnmatch
 import json
+import os
+import re
+import secrets
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from pydantic import BaseModel
-
 from discord_acp_bridge.infrastructure.logging import get_logger
 
 if TYPE_CHECKING:
@@ -20,6 +25,14 @@ logger = get_logger(__name__)
 _AUTO_APPROVE_DIR = ".acp-bridge"
 _AUTO_APPROVE_FILE = "auto_approve.json"
 _CONFIG_FILE = "config.json"
+# スキャン時の警告ログに含めるパスの最大件数
+_LOG_SAMPLE_SIZE = 5
+
+# プロジェクト名に使用できない文字（パス区切り文字 / \ とヌルバイト）
+_INVALID_NAME_CHARS_PATTERN = re.compile(r"[/\\\x00]")
+
+# コンパイル済みの Auto Approve パターン（ツール種別, 入力, 元のパターン文字列）
+_AutoApproveMatcher = tuple[re.Pattern[str], re.Pattern[str], str]
 
 
 class ProjectMode(str, Enum):
@@ -29,7 +42,8 @@ class ProjectMode(str, Enum):
     RW = "rw"
 
 
-class Project(BaseModel):
+@dataclass(frozen=True, slots=True)
+class Project:
     """プロジェクト情報."""
 
     id: int
@@ -63,6 +77,72 @@ class ProjectCreationError(Exception):
         super().__init__(message)
 
 
+def _write_json_atomic(path: Path, data: object) -> os.stat_result:
+    """
+    JSON を一時ファイルに書き込んでから置き換える.
+
+    os.replace による置き換えのため、読み込み側が書き込み途中の内容を読むことはない。
+    一時ファイルは同じディレクトリに一意な名前で作成し、既存ファイルのパーミッションを引き継ぐ。
+    置き換え前に fsync するため、クラッシュしても空や途中までの内容に置き換わることはない。
+
+    Args:
+        path: 書き込み先のパス
+        data: JSON にシリアライズするデータ
+
+    Returns:
+        書き込んだファイルの stat 結果
+
+    Raises:
+        OSError: ファイルへの書き込みに失敗した場合
+    """
+    try:
+        existing_mode: int | None = stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        existing_mode = None
+
+    # 一意な名前で排他的に作成する。新規作成時のパーミッションはカーネルが umask を適用する
+    tmp_path = path.with_name(f".{path.name}.{secrets.token_hex(8)}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            if existing_mode is not None:
+                os.fchmod(f.fileno(), existing_mode)
+            # クラッシュ時に空や途中までのファイルに置き換わらないよう、置き換え前にディスクへ書き出す
+            os.fsync(f.fileno())
+            st = os.fstat(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return st
+
+
+def _compile_auto_approve_pattern(pattern: str) -> _AutoApproveMatcher:
+    """
+    Auto Approve パターンを正規表現にコンパイルする.
+
+    ツール種別は小文字化したうえで比較する（大文字小文字無視）。
+    入力パターンは fnmatchcase と同じく大文字小文字を区別する。
+
+    Args:
+        pattern: ``{kind_pattern}:{input_pattern}`` 形式のパターン
+
+    Returns:
+        (ツール種別の正規表現, 入力の正規表現, 元のパターン文字列)
+    """
+    if ":" in pattern:
+        kind_pat, input_pat = pattern.split(":", 1)
+    else:
+        kind_pat, input_pat = pattern, "*"
+    return (
+        re.compile(fnmatch.translate(kind_pat.lower())),
+        re.compile(fnmatch.translate(input_pat)),
+        pattern,
+    )
+
+
 class ProjectService:
     """プロジェクト管理サービス."""
 
@@ -74,6 +154,38 @@ class ProjectService:
             config: アプリケーション設定
         """
         self._config = config
+        # Trusted Path の正規化結果（resolve はシステムコールを伴うため事前に計算する）
+        self._trusted_resolved: tuple[str, ...] = ()
+        # 配下判定用の文字列表現（完全一致用と、末尾に区切り文字を付けた前方一致用）
+        self._trusted_exact: frozenset[str] = frozenset()
+        self._trusted_prefixes: tuple[str, ...] = ()
+        # list_projects() のキャッシュ（Trusted Path の mtime をキーとする）
+        self._projects_cache: (
+            tuple[tuple[tuple[str, int], ...], list[Project]] | None
+        ) = None
+        # auto_approve.json の解析結果キャッシュ
+        # （ファイルパス -> (st_mtime_ns, st_size, パターン, コンパイル済みパターン)）
+        self._auto_approve_cache: dict[
+            str,
+            tuple[int, int, tuple[str, ...], tuple[_AutoApproveMatcher, ...]],
+        ] = {}
+        self.invalidate_trusted_cache()
+
+    def invalidate_trusted_cache(self) -> None:
+        """
+        Trusted Pathの正規化結果を設定から再計算する.
+
+        設定の trusted_paths を変更した場合や、Trusted Path 自体がシンボリックリンクで
+        リンク先が変わった場合に呼び出す。プロジェクト一覧のキャッシュも破棄される。
+        """
+        self._trusted_resolved = tuple(
+            os.path.realpath(trusted) for trusted in self._config.trusted_paths
+        )
+        self._trusted_exact = frozenset(self._trusted_resolved)
+        self._trusted_prefixes = tuple(
+            os.path.join(trusted, "") for trusted in self._trusted_resolved
+        )
+        self._invalidate_projects_cache()
 
     def _is_path_trusted(self, path: Path) -> bool:
         """
@@ -85,76 +197,185 @@ class ProjectService:
         Returns:
             Trusted Path配下にある場合True
         """
-        abs_path = path.resolve()
-        for trusted in self._config.trusted_paths:
-            trusted_path = Path(trusted).resolve()
-            try:
-                # abs_pathがtrusted_pathの配下にあるかチェック
-                abs_path.relative_to(trusted_path)
-                return True
-            except ValueError:
-                # relative_toが失敗した場合は配下にない
-                continue
-        return False
+        return self._is_resolved_path_trusted(os.path.realpath(path))
 
-    def _scan_project_paths(self) -> list[str]:
+    def _is_resolved_path_trusted(self, resolved: str) -> bool:
         """
-        Trusted Path配下のプロジェクトパスを収集する.
+        正規化済みのパス文字列がTrusted Path配下にあるかチェックする.
+
+        呼び出し側で既に resolve / realpath 済みの場合に、二重の正規化を避けるために使用する。
+
+        Args:
+            resolved: 正規化済みの絶対パス文字列
 
         Returns:
-            ソート済みのプロジェクトパスリスト
+            Trusted Path配下にある場合True
+        """
+        # Trusted Path自身、またはその配下（区切り文字付きの前方一致）であればTrue
+        return resolved in self._trusted_exact or resolved.startswith(
+            self._trusted_prefixes
+        )
+
+    def _scan_trusted_root(self, trusted_str: str) -> tuple[list[str], list[str], bool]:
+        """
+        1つのTrusted Path直下のプロジェクトパスを収集する.
+
+        複数のTrusted Pathを並列にスキャンできるよう、共有状態を変更せず結果を返す。
+
+        Args:
+            trusted_str: 正規化済みのTrusted Path
+
+        Returns:
+            (発見したパス, Trusted Path外のため除外したパス, 権限エラーが発生したか)
         """
         discovered_paths: list[str] = []
+        skipped_paths: list[str] = []
 
-        for trusted in self._config.trusted_paths:
-            trusted_path = Path(trusted).resolve()
-            if not trusted_path.exists():
-                logger.warning("Trusted path does not exist", path=str(trusted_path))
-                continue
+        try:
+            trusted_mode = os.stat(trusted_str).st_mode
+        except OSError:
+            logger.warning("Trusted path does not exist", path=trusted_str)
+            return discovered_paths, skipped_paths, False
 
-            if not trusted_path.is_dir():
-                logger.warning(
-                    "Trusted path is not a directory", path=str(trusted_path)
-                )
-                continue
+        if not stat.S_ISDIR(trusted_mode):
+            logger.warning("Trusted path is not a directory", path=trusted_str)
+            return discovered_paths, skipped_paths, False
 
-            # Trusted Path直下のディレクトリを収集
-            try:
-                for item in trusted_path.iterdir():
-                    if item.is_dir() and not item.name.startswith("."):
-                        resolved = item.resolve()
-                        # シンボリックリンク攻撃を防ぐため、Trusted Path検証を実施
-                        if self._is_path_trusted(resolved):
-                            discovered_paths.append(str(resolved))
-                        else:
-                            logger.warning(
-                                "Skipping directory outside trusted paths",
-                                path=str(resolved),
+        # Trusted Path直下のディレクトリを収集
+        # trusted_str は正規化済みのため、シンボリックリンクでない子エントリは
+        # 結合しただけで正規化済みのパスになる（resolve 不要）
+        try:
+            with os.scandir(trusted_str) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    if not entry.is_symlink():
+                        # d_type を利用するため追加の stat は発生しない
+                        if entry.is_dir(follow_symlinks=False):
+                            discovered_paths.append(
+                                os.path.join(trusted_str, entry.name)
                             )
-            except PermissionError:
-                logger.warning(
-                    "Permission denied when scanning", path=str(trusted_path)
-                )
-                continue
+                        continue
+                    # シンボリックリンクはリンク先を一度だけ解決し、
+                    # シンボリックリンク攻撃を防ぐためTrusted Path検証を実施
+                    resolved = os.path.realpath(entry.path)
+                    if not os.path.isdir(resolved):
+                        continue
+                    if self._is_resolved_path_trusted(resolved):
+                        discovered_paths.append(resolved)
+                    else:
+                        skipped_paths.append(resolved)
+        except PermissionError:
+            return discovered_paths, skipped_paths, True
+
+        return discovered_paths, skipped_paths, False
+
+    def _scan_project_paths(self) -> list[str]:
+        """
+        Trusted Path配下のプロジェクトパスを収集する.
+
+        Trusted Pathが複数ある場合は、低速なマウント上のパスに全体が律速されないよう
+        スレッドプールで並列にスキャンする。スキャンはキャッシュミス時のみ行われるため、
+        プールは呼び出しごとに作成して終了させる。
+
+        Returns:
+            ソート済みのプロジェクトパスリスト
+        """
+        roots = self._trusted_resolved
+        if len(roots) > 1:
+            with ThreadPoolExecutor(
+                max_workers=len(roots), thread_name_prefix="project-scan"
+            ) as pool:
+                results = list(pool.map(self._scan_trusted_root, roots))
+        else:
+            results = [self._scan_trusted_root(root) for root in roots]
+
+        discovered_paths: list[str] = []
+        # ループ内で都度ログを出さず、スキャン後にまとめて出力する
+        skipped_paths: list[str] = []
+        denied_paths: list[str] = []
+        for root, (paths, skipped, denied) in zip(roots, results, strict=True):
+            discovered_paths.extend(paths)
+            skipped_paths.extend(skipped)
+            if denied:
+                denied_paths.append(root)
+
+        if skipped_paths:
+            logger.warning(
+                "Skipping directories outside trusted paths",
+                count=len(skipped_paths),
+                sample=skipped_paths[:_LOG_SAMPLE_SIZE],
+            )
+        if denied_paths:
+            logger.warning(
+                "Permission denied when scanning",
+                count=len(denied_paths),
+                paths=denied_paths,
+            )
 
         discovered_paths.sort()
         return discovered_paths
 
+    def _store_projects_cache(
+        self, key: tuple[tuple[str, int], ...], paths: list[str]
+    ) -> list[Project]:
+        """
+        スキャン済みのパス一覧からプロジェクト一覧を構築してキャッシュする.
+
+        Args:
+            key: _trusted_state_key() で取得したキャッシュキー
+            paths: ソート済みのプロジェクトパスリスト
+
+        Returns:
+            プロジェクト一覧（キャッシュ本体のため呼び出し側で変更しないこと）
+        """
+        projects = [Project(id=idx + 1, path=path) for idx, path in enumerate(paths)]
+        self._projects_cache = (key, projects)
+        return projects
+
+    def _invalidate_projects_cache(self) -> None:
+        """プロジェクト一覧のキャッシュを破棄する."""
+        self._projects_cache = None
+
+    def _trusted_state_key(self) -> tuple[tuple[str, int], ...]:
+        """
+        Trusted Pathの状態を表すキャッシュキーを生成する.
+
+        直下のエントリが追加・削除されるとディレクトリの mtime が更新されるため、
+        各 Trusted Path の mtime をキーにすることでスキャン結果の鮮度を判定できる。
+
+        Returns:
+            (Trusted Path, st_mtime_ns) のタプル。存在しない場合の mtime は -1
+        """
+        key: list[tuple[str, int]] = []
+        for trusted_str in self._trusted_resolved:
+            try:
+                mtime_ns = os.stat(trusted_str).st_mtime_ns
+            except OSError:
+                mtime_ns = -1
+            key.append((trusted_str, mtime_ns))
+        return tuple(key)
+
     def list_projects(self) -> list[Project]:
         """
         Trusted Path配下のディレクトリを自動スキャンしてプロジェクト一覧を取得する.
 
+        Trusted Path の mtime が前回スキャン時から変化していない場合は
+        キャッシュ済みの結果を返す。
+
         Returns:
             プロジェクト一覧（パス名でソート済み、ID順）
         """
-        discovered_paths = self._scan_project_paths()
+        # スキャン前にキーを取得する（スキャン中の変更は次回の呼び出しで検出される）
+        key = self._trusted_state_key()
+        if self._projects_cache is not None and self._projects_cache[0] == key:
+            return list(self._projects_cache[1])
 
-        projects = [
-            Project(id=idx + 1, path=path) for idx, path in enumerate(discovered_paths)
-        ]
+        discovered_paths = self._scan_project_paths()
+        projects = self._store_projects_cache(key, discovered_paths)
 
         logger.debug("Listed projects from trusted paths", project_count=len(projects))
-        return projects
+        return list(projects)
 
     def create_project(self, name: str) -> Project:
         """
@@ -182,7 +403,7 @@ class ProjectService:
             raise ProjectCreationError("プロジェクト名を指定してください。")
 
         # パストラバーサル防止
-        if "/" in name or "\\" in name or "\0" in name:
+        if _INVALID_NAME_CHARS_PATTERN.search(name):
             raise ProjectCreationError(
                 "プロジェクト名にパス区切り文字は使用できません。"
             )
@@ -194,7 +415,7 @@ class ProjectService:
             )
 
         # Trusted Paths[0]配下に作成
-        base_path = Path(self._config.trusted_paths[0]).resolve()
+        base_path = Path(self._trusted_resolved[0])
 
         if not base_path.exists():
             raise ProjectCreationError(f"Trusted Pathが存在しません: {base_path}")
@@ -211,15 +432,27 @@ class ProjectService:
             raise ProjectCreationError(f"既に存在します: {project_path}")
 
         # 防御的チェック: パストラバーサル対策の最終確認
-        if not self._is_path_trusted(project_path):
+        # base_path は正規化済みで、name は区切り文字や `.` 始まりを含まず、
+        # project_path もまだ存在しない（シンボリックリンクではない）ため、
+        # resolve せずに前方一致のみで判定できる
+        if not os.fspath(project_path).startswith(os.path.join(base_path, "")):
             raise ProjectCreationError(
                 "プロジェクト名が不正です。Trusted Path外になります。"
             )
 
+        # 作成前の時点でキャッシュが有効かを確認しておく
+        cache = self._projects_cache
+        cached_projects = (
+            cache[1]
+            if cache is not None and cache[0] == self._trusted_state_key()
+            else None
+        )
+
         # ディレクトリを作成
         try:
             project_path.mkdir(parents=False, exist_ok=False)
         except OSError as e:
+            self._invalidate_projects_cache()
             raise ProjectCreationError(f"ディレクトリの作成に失敗しました: {e}") from e
 
         logger.info(
@@ -229,10 +462,24 @@ class ProjectService:
         )
 
         # パス一覧を取得してIDを計算
+        # キャッシュが有効な場合は再スキャンせず、ソート済みリストへの挿入で済ませる
+        project_str = str(project_path)
+        if cached_projects is not None:
+            all_paths = [project.path for project in cached_projects]
+            bisect.insort(all_paths, project_str)
+            projects = self._store_projects_cache(self._trusted_state_key(), all_paths)
+            # キャッシュに格納したインスタンスをそのまま返す（Project は不変）
+            return projects[bisect.bisect_left(all_paths, project_str)]
+
+        self._invalidate_projects_cache()
         all_paths = self._scan_project_paths()
-        project_id = all_paths.index(str(project_path)) + 1
+        index = bisect.bisect_left(all_paths, project_str)
+        if index == len(all_paths) or all_paths[index] != project_str:
+            raise ProjectCreationError(
+                f"作成したディレクトリがプロジェクト一覧に見つかりません: {project_path}"
+            )
 
-        return Project(id=project_id, path=str(project_path))
+        return Project(id=index + 1, path=project_str)
 
     def _config_path(self, project: Project) -> Path:
         """プロジェクトの設定ファイルパスを返す."""
@@ -260,9 +507,7 @@ class ProjectService:
         path = self._config_path(project)
         try:
             path.parent.mkdir(parents=True, exist_ok=True)
-            path.write_text(
-                json.dumps(config, ensure_ascii=False, indent=2), encoding="utf-8"
-            )
+            _write_json_atomic(path, config)
         except OSError:
             logger.exception("Failed to write config.json", path=str(path))
             raise
@@ -338,18 +583,101 @@ class ProjectService:
                 project_path=project.path,
             )
             return []
+        return list(self._load_auto_approve(project)[0])
+
+    def _load_auto_approve(
+        self, project: Project, st: os.stat_result | None = None
+    ) -> tuple[tuple[str, ...], tuple[_AutoApproveMatcher, ...]]:
+        """
+        auto_approve.json を読み込む（Trusted Path の検証は呼び出し側で行う）.
+
+        ファイルの (st_mtime_ns, st_size) が前回の読み込み時から変化していなければ
+        キャッシュ済みの解析結果を返し、ファイルの読み込みと JSON 解析を省略する。
+        パターンは読み込み時に一度だけ正規表現へコンパイルする。
+
+        Args:
+            project: 対象プロジェクト
+            st: 呼び出し側で取得済みの auto_approve.json の stat 結果（省略時は取得する）
+
+        Returns:
+            (Auto Approve パターン, コンパイル済みパターン)。未設定・読み込み失敗の場合は空
+        """
         path = self._auto_approve_path(project)
-        if not path.exists():
-            return []
+        key = str(path)
+        if st is None:
+            try:
+                st = os.stat(key)
+            except OSError:
+                self._auto_approve_cache.pop(key, None)
+                return (), ()
+
+        cached = self._auto_approve_cache.get(key)
+        if (
+            cached is not None
+            and cached[0] == st.st_mtime_ns
+            and cached[1] == st.st_size
+        ):
+            return cached[2], cached[3]
+
+        patterns: tuple[str, ...] = ()
         try:
             data = json.loads(path.read_text(encoding="utf-8"))
             if isinstance(data, list):
-                return [str(p) for p in data if isinstance(p, str)]
+                patterns = tuple(str(p) for p in data if isinstance(p, str))
         except (json.JSONDecodeError, OSError, UnicodeDecodeError):
             logger.warning(
                 "Failed to read auto_approve.json", path=str(path), exc_info=True
             )
-        return []
+        # 壊れたファイルも空としてキャッシュし、変更されるまで警告を繰り返さない
+        return self._store_auto_approve_cache(key, st, patterns)
+
+    def _store_auto_approve_cache(
+        self, key: str, st: os.stat_result, patterns: tuple[str, ...]
+    ) -> tuple[tuple[str, ...], tuple[_AutoApproveMatcher, ...]]:
+        """
+        auto_approve.json の内容をコンパイルしてキャッシュに格納する.
+
+        Args:
+            key: auto_approve.json のパス文字列
+            st: キャッシュ対象の内容に対応する stat 結果
+            patterns: Auto Approve パターン
+
+        Returns:
+            (Auto Approve パターン, コンパイル済みパターン)
+        """
+        matchers = tuple(_compile_auto_approve_pattern(p) for p in patterns)
+        self._auto_approve_cache[key] = (
+            st.st_mtime_ns,
+            st.st_size,
+            patterns,
+            matchers,
+        )
+        return patterns, matchers
+
+    def _save_auto_approve_patterns(
+        self, project: Project, patterns: list[str]
+    ) -> None:
+        """
+        auto_approve.json を保存し、キャッシュを書き込んだ内容で更新する.
+
+        Args:
+            project: 対象プロジェクト（Trusted Path 検証済みであること）
+            patterns: 保存する Auto Approve パターン
+
+        Raises:
+            OSError: ファイルへの書き込みに失敗した場合
+        """
+        path = self._auto_approve_path(project)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            st = _write_json_atomic(path, patterns)
+        except OSError:
+            logger.exception(
+                "Failed to write auto_approve.json", path=str(path)
+            )
+            raise
+        # 書き込んだ直後のファイルを再度読み込まないよう、キャッシュを直接更新する
+        self._store_auto_approve_cache(str(path), st, tuple(patterns))
 
     def add_auto_approve_pattern(self, project: Project, pattern: str) -> bool:
         """
@@ -379,21 +707,12 @@ class ProjectService:
         if "\n" in pattern or "\r" in pattern:
             msg = "Pattern must not contain newlines"
             raise ValueError(msg)
-        patterns = self.get_auto_approve_patterns(project)
+        # Trusted Path は検証済みのため、再検証を伴わない読み込みを使う
+        patterns = list(self._load_auto_approve(project)[0])
         if pattern in patterns:
             return False
         patterns.append(pattern)
-        path = self._auto_approve_path(project)
-        try:
-            path.parent.mkdir(parents=True, exist_ok=True)
-            path.write_text(
-                json.dumps(patterns, ensure_ascii=False, indent=2), encoding="utf-8"
-            )
-        except OSError:
-            logger.exception(
-                "Failed to write auto_approve.json", path=str(path)
-            )
-            raise
+        self._save_auto_approve_patterns(project, patterns)
         logger.info(
             "Added auto_approve pattern",
             project_path=project.path,
@@ -423,21 +742,12 @@ class ProjectService:
             )
             msg = f"Project path is not within trusted paths: {project.path}"
             raise ValueError(msg)
-        patterns = self.get_auto_approve_patterns(project)
+        # Trusted Path は検証済みのため、再検証を伴わない読み込みを使う
+        patterns = list(self._load_auto_approve(project)[0])
         if pattern not in patterns:
             return False
         patterns.remove(pattern)
-        path = self._auto_approve_path(project)
-        try:
-            path.parent.mkdir(parents=True, exist_ok=True)
-            path.write_text(
-                json.dumps(patterns, ensure_ascii=False, indent=2), encoding="utf-8"
-            )
-        except OSError:
-            logger.exception(
-                "Failed to write auto_approve.json", path=str(path)
-            )
-            raise
+        self._save_auto_approve_patterns(project, patterns)
         logger.info(
             "Removed auto_approve pattern",
             project_path=project.path,
@@ -467,15 +777,24 @@ class ProjectService:
         Returns:
             マッチしたパターン文字列。マッチしない場合は None
         """
-        patterns = self.get_auto_approve_patterns(project)
-        for pattern in patterns:
-            if ":" in pattern:
-                kind_pat, input_pat = pattern.split(":", 1)
-            else:
-                kind_pat, input_pat = pattern, "*"
-            if fnmatch.fnmatch(kind.lower(), kind_pat.lower()) and fnmatch.fnmatchcase(
-                raw_input, input_pat
-            ):
+        # 設定ファイルが存在しない（最も一般的な）場合は、パスの正規化を伴う
+        # Trusted Path の検証を行わずに終了する
+        try:
+            st = os.stat(self._auto_approve_path(project))
+        except OSError:
+            return None
+        if not self._is_path_trusted(Path(project.path)):
+            logger.error(
+                "SECURITY: Attempted to read auto_approve outside trusted paths",
+                project_path=project.path,
+            )
+            return None
+        _, matchers = self._load_auto_approve(project, st)
+        if not matchers:
+            return None
+        kind_lower = kind.lower()
+        for kind_re, input_re, pattern in matchers:
+            if kind_re.match(kind_lower) and input_re.match(raw_input):
                 return pattern
         return None
 
@@ -495,24 +814,24 @@ class ProjectService:
         """
         projects = self.list_projects()
 
-        for project in projects:
-            if project.id == project_id:
-                # Trusted Path検証（防御的チェック）
-                project_path = Path(project.path)
-                if not self._is_path_trusted(project_path):
-                    logger.error(
-                        "SECURITY: Attempted to access path outside trusted paths",
-                        project_path=project.path,
-                        trusted_paths=self._config.trusted_paths,
-                        project_id=project_id,
-                    )
-                    msg = f"Project path is not within trusted paths: {project.path}"
-                    raise ValueError(msg)
-
-                logger.debug(
-                    "Retrieved project", project_id=project_id, path=project.path
-                )
-                return project
-
-        logger.error("Project not found", project_id=project_id)
-        raise ProjectNotFoundError(project_id)
+        # IDはソート順の連番（1始まり）なので直接インデックスで参照できる
+        if not 1 <= project_id <= len(projects):
+            logger.error("Project not found", project_id=project_id)
+            raise ProjectNotFoundError(project_id)
+        project = projects[project_id - 1]
+
+        # Trusted Path検証（防御的チェック）
+        # キャッシュ済みの一覧はスキャン後にシンボリックリンクへ差し替えられている
+        # 可能性があるため、取得のたびに必ず resolve して検証する
+        if not self._is_path_trusted(Path(project.path)):
+            logger.error(
+                "SECURITY: Attempted to access path outside trusted paths",
+                project_path=project.path,
+                trusted_paths=self._config.trusted_paths,
+                project_id=project_id,
+            )
+            msg = f"Project path is not within trusted paths: {project.path}"
+            raise ValueError(msg)
+
+        logger.debug("Retrieved project", project_id=project_id, path=project.path)
+        return project
@@ -3,33 +3,31 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import re
-import uuid
-from collections.abc import Awaitable, Callable
+import secrets
+from collections.abc import Awaitable, Callable, Coroutine
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
+from acp import RequestPermissionResponse
 from acp.schema import (
     AgentMessageChunk,
-    AgentPlanUpdate,
-    AgentThoughtChunk,
-    AvailableCommandsUpdate,
+    AllowedOutcome,
     CurrentModeUpdate,
-    SessionInfoUpdate,
+    DeniedOutcome,
     TextContentBlock,
-    ToolCallProgress,
-    ToolCallStart,
-    UserMessageChunk,
 )
-from pydantic import BaseModel, Field
 
 from discord_acp_bridge.application.models import (
+    PermissionOptionInfo,
     PermissionRequest,  # noqa: TC001
     PermissionResponse,  # noqa: TC001
+    ToolCallInfo,
 )
 from discord_acp_bridge.application.project import (
-    Project,  # noqa: TC001
     ProjectMode,  # noqa: TC001
     ProjectService,  # noqa: TC001
 )
@@ -37,9 +35,21 @@ from discord_acp_bridge.infrastructure.acp_client import ACPClient, UsageUpdate
 from discord_acp_bridge.infrastructure.logging import get_logger
 
 if TYPE_CHECKING:
-    from acp import RequestPermissionResponse
-    from acp.schema import PermissionOption, ToolCallUpdate
-
+    from typing import TypeAlias
+
+    from acp.schema import (
+        AgentPlanUpdate,
+        AgentThoughtChunk,
+        AvailableCommandsUpdate,
+        PermissionOption,
+        SessionInfoUpdate,
+        ToolCallProgress,
+        ToolCallStart,
+        ToolCallUpdate,
+        UserMessageChunk,
+    )
+
+    from discord_acp_bridge.application.project import Project
     from discord_acp_bridge.infrastructure.config import Config
 
 # コールバック型定義
@@ -52,6 +62,17 @@ PermissionRequestCallback = Callable[[PermissionRequest], Awaitable[PermissionRe
 
 logger = get_logger(__name__)
 
+# タイピングインジケーターの再送間隔（秒）
+_TYPING_RESEND_INTERVAL = 5.0
+
+# close_all_sessions で同時に終了処理を行うセッション数の上限
+# （ACP Server プロセスの終了が一度に集中しないようにする）
+_CLOSE_ALL_CONCURRENCY = 16
+
+# メッセージバッファを遅延を待たずに即時フラッシュする文字数
+# （Discord の1メッセージの上限 2000 文字に近づいた時点で送信する）
+_BUFFER_FLUSH_THRESHOLD = 1800
+
 
 class SessionState(str, Enum):
     """セッション状態."""
@@ -62,19 +83,22 @@ class SessionState(str, Enum):
     CLOSED = "closed"
 
 
-# ACP Update型のエイリアス（UsageUpdateは独自定義、将来のSDK対応に備える）
-ACPUpdate = (
-    UserMessageChunk
-    | AgentMessageChunk
-    | AgentThoughtChunk
-    | ToolCallStart
-    | ToolCallProgress
-    | AgentPlanUpdate
-    | AvailableCommandsUpdate
-    | CurrentModeUpdate
-    | SessionInfoUpdate
-    | UsageUpdate
-)
+if TYPE_CHECKING:
+    # ACP Update型のエイリアス（UsageUpdateは独自定義、将来のSDK対応に備える）
+    # 型注釈専用。実行時の判定は _update_handlers による具象クラスの辞書引きで行うため、
+    # isinstance(update, ACPUpdate) のような Union 全体への判定には使用しないこと
+    ACPUpdate: TypeAlias = (
+        UserMessageChunk
+        | AgentMessageChunk
+        | AgentThoughtChunk
+        | ToolCallStart
+        | ToolCallProgress
+        | AgentPlanUpdate
+        | AvailableCommandsUpdate
+        | CurrentModeUpdate
+        | SessionInfoUpdate
+        | UsageUpdate
+    )
 
 # Read モード時に拒否する Write 系ツール種別のセット
 # bash はファイル変更・実行など任意の副作用を伴うため Write 系として扱う
@@ -107,22 +131,23 @@ def _is_write_operation(kind: str) -> bool:
     Returns:
         Write 系の場合 True
     """
-    return kind.lower() in _WRITE_KINDS
+    return kind in _WRITE_KINDS
 
 
-class Session(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class Session:
     """セッション情報."""
 
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=lambda: secrets.token_hex(16))
     user_id: int
     project: Project
     state: SessionState = SessionState.CREATED
     thread_id: int | None = None
     acp_session_id: str | None = None
-    created_at: datetime = Field(default_factory=datetime.now)
-    last_activity_at: datetime = Field(default_factory=datetime.now)
+    created_at: datetime = field(default_factory=datetime.now)
+    last_activity_at: datetime = field(default_factory=datetime.now)
     # モデル情報
-    available_models: list[str] = Field(default_factory=list)
+    available_models: list[str] = field(default_factory=list)
     current_model_id: str | None = None
     # 使用量情報
     context_used: int | None = None
@@ -242,14 +267,32 @@ class SessionService:
         self._acp_clients: dict[str, ACPClient] = {}
         # メッセージバッファリング用（thread_id -> buffer）
         self._message_buffers: dict[int, list[str]] = {}
+        # バッファ内の合計文字数（thread_id -> 文字数）
+        self._message_buffer_lengths: dict[int, int] = {}
         # バッファフラッシュタスク（thread_id -> Task）
         self._flush_tasks: dict[int, asyncio.Task] = {}
-        # タイピングインジケーター管理（thread_id -> Task）
-        self._typing_tasks: dict[int, asyncio.Task] = {}
+        # バッファフラッシュの予定時刻（thread_id -> event loop の時刻）
+        self._flush_deadlines: dict[int, float] = {}
+        # タイピングインジケーターを全スレッドまとめて再送するタスク
+        self._typing_heartbeat_task: asyncio.Task | None = None
+        # 次の再送を待たずにタイピング状態を送信するスレッド
+        self._typing_pending: set[int] = set()
+        # タイピング再送タスクを待機から起こすためのイベント
+        self._typing_wakeup = asyncio.Event()
         # タイピング停止スケジュールタスク（thread_id -> Task）
         self._typing_stop_tasks: dict[int, asyncio.Task] = {}
+        # タイピング停止の予定時刻（thread_id -> event loop の時刻）
+        self._typing_stop_deadlines: dict[int, float] = {}
         # タイピング状態管理（thread_id -> bool）
         self._typing_active: dict[int, bool] = {}
+        # 投げっぱなしのバックグラウンドタスク（完了前にGCされないよう参照を保持する）
+        self._background_tasks: set[asyncio.Task[None]] = set()
+        # session_update 通知の型ごとの処理（update の型 -> ハンドラ）
+        self._update_handlers: dict[type, Callable[[Session, Any], None]] = {
+            CurrentModeUpdate: self._handle_mode_update,
+            UsageUpdate: self._handle_usage_update,
+            AgentMessageChunk: self._handle_message_chunk,
+        }
 
     async def create_session(
         self, user_id: int, project: Project, thread_id: int | None = None
@@ -305,12 +348,7 @@ class SessionService:
             )
 
             # セッションを登録
-            self._sessions[user_id] = session
-            self._session_map[session.id] = session
-            self._acp_session_map[acp_session_id] = session.id
-            self._acp_clients[session.id] = acp_client
-            if thread_id is not None:
-                self._thread_sessions[thread_id] = session.id
+            self._register_session(session, acp_client)
 
             logger.info(
                 "Session created", session_id=session.id, acp_session_id=acp_session_id
@@ -327,7 +365,9 @@ class SessionService:
         """
         タイピングインジケーターを開始する.
 
-        5秒毎にタイピング状態を再送するバックグラウンドタスクを起動する。
+        タイピング状態はサービス全体で1つのバックグラウンドタスクが
+        アクティブな全スレッドに対して5秒毎に再送する。
+        開始したスレッドには次の再送を待たずに送信する。
 
         Args:
             thread_id: DiscordスレッドID
@@ -335,30 +375,70 @@ class SessionService:
         if self._on_typing_callback is None:
             return
 
-        # ローカル変数にキャプチャ（型の絞り込みを保持）
-        callback = self._on_typing_callback
-
-        # 既存のタスクをキャンセル（再起動のため）
-        if thread_id in self._typing_tasks:
-            self._typing_tasks[thread_id].cancel()
+        if self._typing_active.get(thread_id, False):
             logger.debug("Restarting typing indicator for thread", thread_id=thread_id)
         else:
             logger.debug("Starting typing indicator for thread", thread_id=thread_id)
 
         self._typing_active[thread_id] = True
+        self._typing_pending.add(thread_id)
+        self._typing_wakeup.set()
 
-        async def typing_loop() -> None:
-            try:
-                while self._typing_active.get(thread_id, False):
-                    await callback(thread_id, True)
-                    await asyncio.sleep(5)  # 5秒毎に再送
-            except asyncio.CancelledError:
-                # キャンセルは正常な動作
-                pass
-            except Exception:
-                logger.exception("Error in typing loop for thread", thread_id=thread_id)
+        if self._typing_heartbeat_task is None or self._typing_heartbeat_task.done():
+            self._typing_heartbeat_task = asyncio.create_task(
+                self._typing_heartbeat(self._on_typing_callback)
+            )
+
+    async def _typing_heartbeat(self, callback: TypingCallback) -> None:
+        """
+        アクティブな全スレッドにタイピング状態を再送する.
 
-        self._typing_tasks[thread_id] = asyncio.create_task(typing_loop())
+        タイピング中のスレッドがなくなると終了する。
+
+        Args:
+            callback: タイピングインジケーター制御コールバック
+        """
+        loop = asyncio.get_running_loop()
+        next_resend_at = loop.time()
+        try:
+            while self._typing_active:
+                # 送信中に開始されたスレッドを取りこぼさないよう、対象の収集前にクリアする
+                self._typing_wakeup.clear()
+                if loop.time() >= next_resend_at:
+                    next_resend_at = loop.time() + _TYPING_RESEND_INTERVAL
+                    self._typing_pending.clear()
+                    thread_ids = [
+                        tid for tid, active in self._typing_active.items() if active
+                    ]
+                else:
+                    thread_ids = [
+                        tid
+                        for tid in self._typing_pending
+                        if self._typing_active.get(tid, False)
+                    ]
+                    self._typing_pending.clear()
+
+                results = await asyncio.gather(
+                    *(callback(tid, True) for tid in thread_ids),
+                    return_exceptions=True,
+                )
+                for tid, result in zip(thread_ids, results, strict=True):
+                    if isinstance(result, Exception):
+                        logger.error(
+                            "Error in typing loop for thread",
+                            thread_id=tid,
+                            exc_info=result,
+                        )
+
+                # 次の再送時刻まで、または新しいスレッドの開始まで待機
+                try:
+                    async with asyncio.timeout(next_resend_at - loop.time()):
+                        await self._typing_wakeup.wait()
+                except TimeoutError:
+                    pass
+        except asyncio.CancelledError:
+            # キャンセルは正常な動作
+            pass
 
     async def _stop_typing(self, thread_id: int) -> None:
         """
@@ -372,16 +452,13 @@ class SessionService:
 
         logger.debug("Stopping typing indicator for thread", thread_id=thread_id)
         self._typing_active[thread_id] = False
-
-        # タスクをキャンセル
-        if thread_id in self._typing_tasks:
-            self._typing_tasks[thread_id].cancel()
-            del self._typing_tasks[thread_id]
+        self._typing_pending.discard(thread_id)
 
         # 停止スケジュールタスクもキャンセル
-        if thread_id in self._typing_stop_tasks:
-            self._typing_stop_tasks[thread_id].cancel()
-            del self._typing_stop_tasks[thread_id]
+        stop_task = self._typing_stop_tasks.pop(thread_id, None)
+        if stop_task is not None and stop_task is not asyncio.current_task():
+            stop_task.cancel()
+        self._typing_stop_deadlines.pop(thread_id, None)
 
         # 停止通知を送信
         if self._on_typing_callback is not None:
@@ -393,14 +470,20 @@ class SessionService:
                     thread_id=thread_id,
                 )
 
-        # 状態マップから削除
-        del self._typing_active[thread_id]
+        # 状態マップから削除（停止通知の送信中に他の呼び出しで削除済みの場合がある）
+        self._typing_active.pop(thread_id, None)
+
+        # タイピング中のスレッドがなくなったら再送タスクを停止
+        if not self._typing_active and self._typing_heartbeat_task is not None:
+            self._typing_heartbeat_task.cancel()
+            self._typing_heartbeat_task = None
 
     def _schedule_typing_stop(self, thread_id: int, delay: float = 2.0) -> None:
         """
         タイピングインジケーター停止をスケジュールする.
 
-        既存の停止タスクがあればキャンセルして、新しいタスクをスケジュールする。
+        停止の予定時刻を呼び出しから delay 秒後に更新する。待機中の停止タスクが
+        あれば予定時刻の更新のみを行い、タスクの再作成は行わない。
         これにより、update受信中はタイピングが継続し、updateが止まって
         一定時間経過後に自動的に停止する。
 
@@ -412,13 +495,26 @@ class SessionService:
         if not self._typing_active.get(thread_id, False):
             return
 
-        # 既存の停止タスクをキャンセル
-        if thread_id in self._typing_stop_tasks:
-            self._typing_stop_tasks[thread_id].cancel()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + delay
+        task = self._typing_stop_tasks.get(thread_id)
+        if task is not None and not task.done():
+            if deadline >= self._typing_stop_deadlines.get(thread_id, deadline):
+                # 待機中のタスクが新しい予定時刻まで待ち直す
+                self._typing_stop_deadlines[thread_id] = deadline
+                return
+            # 予定時刻を早める場合は待機中のタスクを作り直す
+            task.cancel()
+        self._typing_stop_deadlines[thread_id] = deadline
 
         async def delayed_stop() -> None:
             try:
-                await asyncio.sleep(delay)
+                # 待機中に予定時刻が延長された場合は、その時刻まで待ち直す
+                while (
+                    remaining := self._typing_stop_deadlines.get(thread_id, 0)
+                    - loop.time()
+                ) > 0:
+                    await asyncio.sleep(remaining)
                 # 停止タスクがキャンセルされずにここまで来た場合のみ停止
                 if self._typing_active.get(thread_id, False):
                     await self._stop_typing(thread_id)
@@ -430,7 +526,7 @@ class SessionService:
                     "Error in delayed typing stop for thread", thread_id=thread_id
                 )
 
-        self._typing_stop_tasks[thread_id] = asyncio.create_task(delayed_stop())
+        self._typing_stop_tasks[thread_id] = loop.create_task(delayed_stop())
 
     async def start_typing_for_thread(self, thread_id: int) -> None:
         """
@@ -655,43 +751,7 @@ class SessionService:
             raise SessionNotFoundError(session_id)
 
         logger.info("Closing session", session_id=session_id)
-
-        # バッファに残っているメッセージを送信
-        if session.thread_id is not None:
-            # フラッシュタスクをキャンセル
-            if session.thread_id in self._flush_tasks:
-                self._flush_tasks[session.thread_id].cancel()
-            # バッファをフラッシュ
-            await self._flush_message_buffer(session.thread_id)
-            # タイピングインジケーターを停止
-            await self._stop_typing(session.thread_id)
-
-        acp_client = self._acp_clients.get(session_id)
-        if acp_client is not None and session.acp_session_id is not None:
-            try:
-                # ACP Serverにキャンセル通知を送信
-                await acp_client.cancel_session(session.acp_session_id)
-                # ACP Clientをクローズ
-                await acp_client.close()
-            except Exception:
-                logger.exception("Error closing ACP client")
-            finally:
-                del self._acp_clients[session_id]
-
-        # セッション状態を更新
-        session.state = SessionState.CLOSED
-        session.last_activity_at = datetime.now()
-
-        # マップからは削除しない（状態で判断できるようにする）
-        # 将来的にクリーンアップ処理を実装する
-        if session.thread_id is not None and session.thread_id in self._thread_sessions:
-            del self._thread_sessions[session.thread_id]
-        if (
-            session.acp_session_id is not None
-            and session.acp_session_id in self._acp_session_map
-        ):
-            del self._acp_session_map[session.acp_session_id]
-
+        await self._teardown(session, graceful=True)
         logger.info("Session closed", session_id=session_id)
 
     async def kill_session(self, session_id: str) -> None:
@@ -709,42 +769,44 @@ class SessionService:
             raise SessionNotFoundError(session_id)
 
         logger.warning("Force killing session", session_id=session_id)
+        await self._teardown(session, graceful=False)
+        logger.warning("Session killed", session_id=session_id)
+
+    async def _teardown(self, session: Session, *, graceful: bool) -> None:
+        """
+        セッションを終了し、関連するリソースを解放する.
 
+        Args:
+            session: 終了するセッション
+            graceful: True の場合は ACP Server にキャンセル通知を送信してから
+                クローズする。False の場合は ACP Client を即座にクローズする
+        """
         # バッファに残っているメッセージを送信
         if session.thread_id is not None:
             # フラッシュタスクをキャンセル
-            if session.thread_id in self._flush_tasks:
-                self._flush_tasks[session.thread_id].cancel()
+            self._cancel_buffer_flush(session.thread_id)
             # バッファをフラッシュ
             await self._flush_message_buffer(session.thread_id)
             # タイピングインジケーターを停止
             await self._stop_typing(session.thread_id)
 
-        acp_client = self._acp_clients.get(session_id)
+        acp_client = self._acp_clients.pop(session.id, None)
         if acp_client is not None:
             try:
-                # ACP Clientを強制クローズ（プロセスkill）
+                if graceful and session.acp_session_id is not None:
+                    # ACP Serverにキャンセル通知を送信
+                    await acp_client.cancel_session(session.acp_session_id)
+                # ACP Clientをクローズ（強制終了時はプロセスkill）
                 await acp_client.close()
             except Exception:
-                logger.exception("Error killing ACP client")
-            finally:
-                del self._acp_clients[session_id]
-
-        # セッション状態を更新
-        session.state = SessionState.CLOSED
-        session.last_activity_at = datetime.now()
-
-        # マップからは削除しない（状態で判断できるようにする）
-        # 将来的にクリーンアップ処理を実装する
-        if session.thread_id is not None and session.thread_id in self._thread_sessions:
-            del self._thread_sessions[session.thread_id]
-        if (
-            session.acp_session_id is not None
-            and session.acp_session_id in self._acp_session_map
-        ):
-            del self._acp_session_map[session.acp_session_id]
+                logger.exception(
+                    "Error closing ACP client"
+                    if graceful
+                    else "Error killing ACP client"
+                )
 
-        logger.warning("Session killed", session_id=session_id)
+        # セッションを終了状態にして検索用マップから外す
+        self._evict_session(session)
 
     async def close_all_sessions(self) -> None:
         """
@@ -754,62 +816,87 @@ class SessionService:
         """
         logger.info("Closing all active sessions...")
 
-        # アクティブセッションのリストを取得（イテレート中の変更を避けるためコピー）
-        active_sessions = [
-            session for session in self._sessions.values() if session.is_active()
+        # アクティブセッションのIDを取得（イテレート中の変更を避けるためコピー）
+        session_ids = [
+            session.id for session in self._sessions.values() if session.is_active()
         ]
 
-        if not active_sessions:
+        if not session_ids:
             logger.info("No active sessions to close")
             return
 
-        logger.info("Closing %d active session(s)", len(active_sessions))
+        logger.info("Closing %d active session(s)", len(session_ids))
 
-        # すべてのセッションを並列にクローズ
-        close_tasks = [self.close_session(session.id) for session in active_sessions]
+        # すべてのセッションを並列にクローズ（同時実行数は上限まで）
+        semaphore = asyncio.Semaphore(_CLOSE_ALL_CONCURRENCY)
+
+        async def close_with_limit(session_id: str) -> None:
+            async with semaphore:
+                await self.close_session(session_id)
 
         # すべての終了処理を待機（エラーが発生しても続行）
-        results = await asyncio.gather(*close_tasks, return_exceptions=True)
+        results = await asyncio.gather(
+            *(close_with_limit(session_id) for session_id in session_ids),
+            return_exceptions=True,
+        )
 
         # エラーをログに記録
-        for i, result in enumerate(results):
+        for session_id, result in zip(session_ids, results, strict=True):
             if isinstance(result, Exception):
                 logger.error(
                     "Error closing session",
-                    session_id=active_sessions[i].id,
+                    session_id=session_id,
                     error=str(result),
                 )
 
         logger.info("All sessions closed")
 
-    def _get_session_by_id(self, session_id: str) -> Session | None:
+    def _register_session(self, session: Session, acp_client: ACPClient) -> None:
         """
-        セッションIDからセッションを検索する.
+        セッションを各検索用マップに登録する.
 
         Args:
-            session_id: セッションID
+            session: 登録するセッション（acp_session_id 設定済み）
+            acp_client: セッションに対応するACP Client
+        """
+        self._sessions[session.user_id] = session
+        self._session_map[session.id] = session
+        self._acp_clients[session.id] = acp_client
+        if session.acp_session_id is not None:
+            self._acp_session_map[session.acp_session_id] = session.id
+        if session.thread_id is not None:
+            self._thread_sessions[session.thread_id] = session.id
 
-        Returns:
-            該当するセッション。なければNone
+    def _evict_session(self, session: Session) -> None:
         """
-        return self._session_map.get(session_id)
+        セッションを終了状態にし、スレッドID・ACPセッションIDの検索用マップから削除する.
 
-    async def _safe_callback_wrapper(
-        self, callback: MessageCallback | TimeoutCallback, *args: int | str
-    ) -> None:
+        セッション本体は状態で判断できるよう _sessions / _session_map に残す。
+        ACP Clientへの参照も削除する。
+
+        Args:
+            session: 終了したセッション
         """
-        コールバックを安全に実行するラッパー.
+        session.state = SessionState.CLOSED
+        session.last_activity_at = datetime.now()
+
+        if session.thread_id is not None:
+            self._thread_sessions.pop(session.thread_id, None)
+        if session.acp_session_id is not None:
+            self._acp_session_map.pop(session.acp_session_id, None)
+        self._acp_clients.pop(session.id, None)
 
-        例外が発生してもログに記録し、タスクをクラッシュさせない。
+    def _get_session_by_id(self, session_id: str) -> Session | None:
+        """
+        セッションIDからセッションを検索する.
 
         Args:
-            callback: 実行するコールバック関数
-            *args: コールバックに渡す引数
+            session_id: セッションID
+
+        Returns:
+            該当するセッション。なければNone
         """
-        try:
-            await callback(*args)  # type: ignore[arg-type]
-        except Exception:
-            logger.exception("Error in callback", callback_name=callback.__name__)
+        return self._session_map.get(session_id)
 
     async def _flush_message_buffer(self, thread_id: int) -> None:
         """
@@ -818,20 +905,15 @@ class SessionService:
         Args:
             thread_id: スレッドID
         """
-        # バッファが空の場合は何もしない
-        if (
-            thread_id not in self._message_buffers
-            or not self._message_buffers[thread_id]
-        ):
+        # バッファの内容を取り出してクリア（空の場合は何もしない）
+        buffer = self._message_buffers.pop(thread_id, None)
+        if not buffer:
             return
-
-        # バッファの内容を取得してクリア
-        buffer = self._message_buffers[thread_id]
-        self._message_buffers[thread_id] = []
+        self._message_buffer_lengths.pop(thread_id, None)
 
         # タスクをクリーンアップ
-        if thread_id in self._flush_tasks:
-            del self._flush_tasks[thread_id]
+        self._flush_tasks.pop(thread_id, None)
+        self._flush_deadlines.pop(thread_id, None)
 
         # バッファの内容を結合して送信
         content = "".join(buffer)
@@ -848,24 +930,68 @@ class SessionService:
                     "Error flushing message buffer to thread", thread_id=thread_id
                 )
 
+    def _append_to_message_buffer(self, thread_id: int, text: str) -> None:
+        """
+        メッセージバッファにテキストを追加し、フラッシュをスケジュールする.
+
+        バッファが Discord の1メッセージ分に近づいた場合は遅延を待たずにフラッシュする。
+
+        Args:
+            thread_id: スレッドID
+            text: 追加するテキスト
+        """
+        self._message_buffers.setdefault(thread_id, []).append(text)
+        buffered = self._message_buffer_lengths.get(thread_id, 0) + len(text)
+        self._message_buffer_lengths[thread_id] = buffered
+
+        if buffered >= _BUFFER_FLUSH_THRESHOLD:
+            self._schedule_buffer_flush(thread_id, delay=0)
+        else:
+            self._schedule_buffer_flush(thread_id)
+
+    def _cancel_buffer_flush(self, thread_id: int) -> None:
+        """
+        スケジュール済みのバッファフラッシュをキャンセルする.
+
+        Args:
+            thread_id: スレッドID
+        """
+        task = self._flush_tasks.pop(thread_id, None)
+        if task is not None:
+            task.cancel()
+        self._flush_deadlines.pop(thread_id, None)
+
     def _schedule_buffer_flush(self, thread_id: int, delay: float = 1.5) -> None:
         """
         バッファフラッシュをスケジュールする.
 
-        既存のタスクがあればキャンセルして、新しいタスクをスケジュールする。
+        最後の呼び出しから delay 秒後にフラッシュする。既存のタスクが待機中であれば
+        予定時刻を延長するだけで、タスクの再作成は行わない。
 
         Args:
             thread_id: スレッドID
             delay: 遅延時間（秒）
         """
-        # 既存のタスクをキャンセル
-        if thread_id in self._flush_tasks:
-            self._flush_tasks[thread_id].cancel()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + delay
+        task = self._flush_tasks.get(thread_id)
+        if task is not None and not task.done():
+            if deadline >= self._flush_deadlines.get(thread_id, deadline):
+                # 待機中のタスクが新しい予定時刻まで待ち直す
+                self._flush_deadlines[thread_id] = deadline
+                return
+            # 予定時刻を早める場合は待機中のタスクを作り直す
+            task.cancel()
+        self._flush_deadlines[thread_id] = deadline
 
         # 新しいフラッシュタスクを作成
         async def delayed_flush() -> None:
             try:
-                await asyncio.sleep(delay)
+                # 待機中に予定時刻が延長された場合は、その時刻まで待ち直す
+                while (
+                    remaining := self._flush_deadlines.get(thread_id, 0) - loop.time()
+                ) > 0:
+                    await asyncio.sleep(remaining)
                 await self._flush_message_buffer(thread_id)
             except asyncio.CancelledError:
                 # キャンセルは正常な動作なので再スロー
@@ -877,7 +1003,7 @@ class SessionService:
                     thread_id=thread_id,
                 )
 
-        self._flush_tasks[thread_id] = asyncio.create_task(delayed_flush())
+        self._flush_tasks[thread_id] = loop.create_task(delayed_flush())
 
     def _on_session_update(self, acp_session_id: str, update: ACPUpdate) -> None:
         """
@@ -888,12 +1014,7 @@ class SessionService:
             update: 更新内容
         """
         # ACPセッションIDから対応するセッションを検索
-        session = None
-        for s in self._sessions.values():
-            if s.acp_session_id == acp_session_id:
-                session = s
-                break
-
+        session = self._find_session_by_acp_id(acp_session_id)
         if session is None:
             logger.warning(
                 "Session not found for ACP session", acp_session_id=acp_session_id
@@ -908,60 +1029,83 @@ class SessionService:
         if session.thread_id is not None:
             self._schedule_typing_stop(session.thread_id, delay=2.0)
 
+        update_type = type(update)
         logger.debug(
             "Session update",
             session_id=session.id,
             acp_session_id=acp_session_id,
-            update_type=type(update).__name__,
+            update_type=update_type.__name__,
         )
 
-        # CurrentModeUpdate通知を処理（モード変更通知）
-        # Note: CurrentModeUpdateはセッションモードの変更通知であり、モデル変更通知ではない。
-        # ACP プロトコルにはモデル変更の通知メカニズムが定義されていないため、
-        # モデル変更後はset_session_model呼び出し側で楽観的に更新する。
-        if isinstance(update, CurrentModeUpdate):
-            logger.debug(
-                "Mode changed for session",
-                session_id=session.id,
-                mode_id=update.current_mode_id,
-            )
+        # 型ごとの処理を1回の辞書引きで選択する
+        handler = self._update_handlers.get(update_type)
+        if handler is not None:
+            handler(session, update)
 
-        # UsageUpdate通知を処理（使用量更新通知）
-        if isinstance(update, UsageUpdate):
-            session.context_used = update.used
-            session.context_size = update.size
-            if update.cost is not None:
-                session.total_cost = update.cost.amount
-                session.cost_currency = update.cost.currency
-            logger.debug(
-                "Usage updated for session",
-                session_id=session.id,
-                tokens_used=update.used,
-                tokens_size=update.size,
-                cost_amount=update.cost.amount if update.cost else None,
-                cost_currency=update.cost.currency if update.cost else None,
-            )
+    def _handle_mode_update(self, session: Session, update: CurrentModeUpdate) -> None:
+        """
+        CurrentModeUpdate通知を処理する（モード変更通知）.
 
-        # エージェントのメッセージをバッファに追加
-        if (
-            isinstance(update, AgentMessageChunk)
-            and isinstance(update.content, TextContentBlock)
-            and update.content.text
-        ):
-            if self._on_message_callback and session.thread_id:
-                # バッファに追加
-                if session.thread_id not in self._message_buffers:
-                    self._message_buffers[session.thread_id] = []
-                self._message_buffers[session.thread_id].append(update.content.text)
+        Note: CurrentModeUpdateはセッションモードの変更通知であり、モデル変更通知ではない。
+        ACP プロトコルにはモデル変更の通知メカニズムが定義されていないため、
+        モデル変更後はset_session_model呼び出し側で楽観的に更新する。
 
-                # バッファフラッシュをスケジュール（既存のタスクがあればキャンセルして再スケジュール）
-                self._schedule_buffer_flush(session.thread_id)
+        Args:
+            session: 通知対象のセッション
+            update: モード変更通知
+        """
+        logger.debug(
+            "Mode changed for session",
+            session_id=session.id,
+            mode_id=update.current_mode_id,
+        )
 
-                logger.debug(
-                    "Added message chunk to buffer",
-                    thread_id=session.thread_id,
-                    buffer_size=len(self._message_buffers[session.thread_id]),
-                )
+    def _handle_usage_update(self, session: Session, update: UsageUpdate) -> None:
+        """
+        UsageUpdate通知を処理する（使用量更新通知）.
+
+        Args:
+            session: 通知対象のセッション
+            update: 使用量更新通知
+        """
+        session.context_used = update.used
+        session.context_size = update.size
+        if update.cost is not None:
+            session.total_cost = update.cost.amount
+            session.cost_currency = update.cost.currency
+        logger.debug(
+            "Usage updated for session",
+            session_id=session.id,
+            tokens_used=update.used,
+            tokens_size=update.size,
+            cost_amount=update.cost.amount if update.cost else None,
+            cost_currency=update.cost.currency if update.cost else None,
+        )
+
+    def _handle_message_chunk(
+        self, session: Session, update: AgentMessageChunk
+    ) -> None:
+        """
+        エージェントのメッセージをバッファに追加する.
+
+        Args:
+            session: 通知対象のセッション
+            update: エージェントのメッセージチャンク
+        """
+        # 送信先（コールバックとスレッド）がない場合は内容の確認も行わない
+        if not (self._on_message_callback and session.thread_id):
+            return
+        # ストリーミング中のチャンクはほぼすべてテキストのため、型の同一性で判定する
+        content = update.content
+        if type(content) is TextContentBlock and (text := content.text):
+            # バッファに追加してフラッシュをスケジュール
+            self._append_to_message_buffer(session.thread_id, text)
+
+            logger.debug(
+                "Added message chunk to buffer",
+                thread_id=session.thread_id,
+                buffer_size=len(self._message_buffers[session.thread_id]),
+            )
 
     def _on_timeout(self, acp_session_id: str) -> None:
         """
@@ -971,12 +1115,7 @@ class SessionService:
             acp_session_id: ACPセッションID
         """
         # ACPセッションIDから対応するセッションを検索
-        session = None
-        for s in self._sessions.values():
-            if s.acp_session_id == acp_session_id:
-                session = s
-                break
-
+        session = self._find_session_by_acp_id(acp_session_id)
         if session is None:
             logger.warning(
                 "Session not found for ACP session (timeout)",
@@ -991,26 +1130,36 @@ class SessionService:
             thread_id = session.thread_id  # 型の絞り込みを保持するためにキャプチャ
 
             # フラッシュタスクをキャンセル
-            if thread_id in self._flush_tasks:
-                self._flush_tasks[thread_id].cancel()
+            self._cancel_buffer_flush(thread_id)
 
             # バッファをフラッシュしてからタイムアウト通知を送信
             async def flush_and_notify() -> None:
                 try:
                     # バッファをフラッシュ
                     await self._flush_message_buffer(thread_id)
-                    # タイピングインジケーターを停止
-                    await self._stop_typing(thread_id)
-                    # フラッシュ後にタイムアウト通知を送信
+                    # フラッシュ後にタイピングインジケーターの停止とタイムアウト通知を並行して送信
+                    notifications: list[Awaitable[None]] = [
+                        self._stop_typing(thread_id)
+                    ]
                     if self._on_timeout_callback:
-                        await self._on_timeout_callback(thread_id)
+                        notifications.append(self._on_timeout_callback(thread_id))
+                    results = await asyncio.gather(
+                        *notifications, return_exceptions=True
+                    )
+                    for result in results:
+                        if isinstance(result, Exception):
+                            logger.error(
+                                "Error sending timeout notification for thread",
+                                thread_id=thread_id,
+                                exc_info=result,
+                            )
                 except Exception:
                     logger.exception(
                         "Error flushing buffer or sending timeout notification for thread",
                         thread_id=thread_id,
                     )
 
-            asyncio.create_task(flush_and_notify())
+            self._spawn_background_task(flush_and_notify())
             logger.debug(
                 "Scheduled buffer flush and timeout notification for thread",
                 thread_id=thread_id,
@@ -1018,20 +1167,7 @@ class SessionService:
 
         # セッションを強制終了
         # 注: この時点でACPプロセスは既にkillされている
-        session.state = SessionState.CLOSED
-        session.last_activity_at = datetime.now()
-
-        # マップからは削除しない（状態で判断できるようにする）
-        # ただし、スレッドマッピングとACPクライアントは削除
-        if session.thread_id is not None and session.thread_id in self._thread_sessions:
-            del self._thread_sessions[session.thread_id]
-        if (
-            session.acp_session_id is not None
-            and session.acp_session_id in self._acp_session_map
-        ):
-            del self._acp_session_map[session.acp_session_id]
-        if session.id in self._acp_clients:
-            del self._acp_clients[session.id]
+        self._evict_session(session)
 
     async def _handle_permission_request(
         self,
@@ -1053,17 +1189,8 @@ class SessionService:
         Returns:
             RequestPermissionResponse
         """
-        from acp import RequestPermissionResponse as _RPR
-        from acp.schema import AllowedOutcome, DeniedOutcome
-
-        from discord_acp_bridge.application.models import (
-            PermissionOptionInfo,
-            ToolCallInfo,
-        )
-
         # セッションを先に検索（read モードチェックを early return より前に行うため）
         session = self._find_session_by_acp_id(acp_session_id)
-        raw_input_str = _format_raw_input(tool_call.raw_input)
         kind = _resolve_tool_kind(tool_call.kind, tool_call.title)
 
         # プロジェクトの権限モードチェック（read モード時は Write 系を自動拒否）
@@ -1076,7 +1203,9 @@ class SessionService:
                     session_id=session.id,
                     kind=kind,
                 )
-                return _RPR(outcome=DeniedOutcome(outcome="cancelled"))
+                return RequestPermissionResponse(
+                    outcome=DeniedOutcome(outcome="cancelled")
+                )
 
         # 自動承認: コールバックなし or timeout=0
         if (
@@ -1096,7 +1225,9 @@ class SessionService:
         # .acp-bridge/ ディレクトリへの操作は Auto Approve をバイパスし、
         # 必ず Discord UI でユーザーに確認を求める
         # セキュリティ上重要なチェックのため、切り詰めなしの全文字列で検査する
+        # 表示・パターンマッチング用の文字列は同じ変換結果を切り詰めて使う
         full_raw_input_str = _raw_input_to_full_str(tool_call.raw_input)
+        raw_input_str = full_raw_input_str[:_RAW_INPUT_DISPLAY_LENGTH]
         bypass_auto_approve = _targets_acp_bridge_dir(full_raw_input_str)
         if bypass_auto_approve:
             logger.info(
@@ -1134,22 +1265,21 @@ class SessionService:
                 raw_input=raw_input_str,
                 content_summary=_format_content_summary(tool_call.content),
             ),
-            options=[
+            options=tuple(
                 PermissionOptionInfo(
                     option_id=o.option_id,
                     name=o.name,
                     kind=o.kind,
                 )
                 for o in options
-            ],
+            ),
         )
 
         # Discord UIにパーミッション要求を送信し、応答を待つ
         try:
-            perm_response = await asyncio.wait_for(
-                self._on_permission_request_callback(perm_request),
-                timeout=self._config.permission_timeout,
-            )
+            # 負の値は Config で拒否され、0 は上で自動承認済みのため、ここでは常に正の値
+            async with asyncio.timeout(self._config.permission_timeout):
+                perm_response = await self._on_permission_request_callback(perm_request)
         except TimeoutError:
             logger.warning(
                 "Permission request timed out, auto-approving",
@@ -1163,14 +1293,7 @@ class SessionService:
             option_id = perm_response.option_id
             if option_id is None and options:
                 # デフォルトは allow_always を優先、なければ allow_once
-                selected = next(
-                    (o for o in options if o.kind == "allow_always"),
-                    next(
-                        (o for o in options if o.kind == "allow_once"),
-                        options[0],
-                    ),
-                )
-                option_id = selected.option_id
+                option_id = _select_default_allow_option(options).option_id
             if option_id is not None:
                 outcome: AllowedOutcome | DeniedOutcome = AllowedOutcome(
                     outcome="selected", option_id=option_id
@@ -1209,7 +1332,7 @@ class SessionService:
                     pattern=perm_response.auto_approve_pattern,
                 )
 
-        return _RPR(outcome=outcome)
+        return RequestPermissionResponse(outcome=outcome)
 
     def _find_session_by_acp_id(self, acp_session_id: str) -> Session | None:
         """ACPセッションIDからセッションを検索する."""
@@ -1223,9 +1346,6 @@ class SessionService:
         options: list[PermissionOption],
     ) -> RequestPermissionResponse:
         """パーミッション要求を自動承認する."""
-        from acp import RequestPermissionResponse as _RPR
-        from acp.schema import AllowedOutcome, DeniedOutcome
-
         if options:
             selected = next(
                 (o for o in options if o.kind == "allow_always"),
@@ -1236,7 +1356,26 @@ class SessionService:
             )
         else:
             outcome = DeniedOutcome(outcome="cancelled")
-        return _RPR(outcome=outcome)
+        return RequestPermissionResponse(outcome=outcome)
+
+    def _spawn_background_task(
+        self, coro: Coroutine[Any, Any, None]
+    ) -> asyncio.Task[None]:
+        """
+        完了を待たないバックグラウンドタスクを起動する.
+
+        イベントループはタスクへの弱参照しか持たないため、完了するまで参照を保持する。
+
+        Args:
+            coro: 実行するコルーチン
+
+        Returns:
+            起動したタスク
+        """
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
 
     def _send_rejection_instructions(self, session_id: str, instructions: str) -> None:
         """拒否+指示時に非同期でsend_promptを送信する."""
@@ -1250,7 +1389,7 @@ class SessionService:
                     session_id=session_id,
                 )
 
-        task = asyncio.create_task(_send())
+        task = self._spawn_background_task(_send())
 
         def _handle_task_exception(t: asyncio.Task[None]) -> None:
             if not t.cancelled() and t.exception() is not None:
@@ -1267,6 +1406,13 @@ class SessionService:
 # 例: "rm -rf .acp-bridge"、'cat ".acp-bridge/auto_approve.json"'
 _ACP_BRIDGE_PATH_PATTERN = re.compile(r"(^|[/\\\s\"'])\.acp-bridge([/\\\s\"']|$)")
 
+# 表示・Auto Approve パターンマッチングに使う raw_input の最大文字数
+_RAW_INPUT_DISPLAY_LENGTH = 500
+
+# title から kind を推測する際の正規化パターン
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_NON_KIND_CHAR_PATTERN = re.compile(r"[^a-z0-9_]")
+
 
 def _targets_acp_bridge_dir(raw_input: str) -> bool:
     r"""raw_input が .acp-bridge ディレクトリを対象としているか判定する.
@@ -1280,41 +1426,28 @@ def _targets_acp_bridge_dir(raw_input: str) -> bool:
     Returns:
         .acp-bridge を対象としている場合 True
     """
+    # 大半の入力には .acp-bridge が含まれないため、部分文字列検索で先に除外する
+    if ".acp-bridge" not in raw_input:
+        return False
     return bool(_ACP_BRIDGE_PATH_PATTERN.search(raw_input))
 
 
 def _raw_input_to_full_str(raw_input: object) -> str:
-    """ToolCallUpdate.raw_input を切り詰めなしで文字列に変換する（セキュリティ検査用）.
+    """ToolCallUpdate.raw_input を切り詰めなしで文字列に変換する.
 
-    セキュリティ上重要なチェック（.acp-bridge/ バイパス等）に使用する。
-    表示・パターンマッチング目的には _format_raw_input を使用すること。
+    セキュリティ上重要なチェック（.acp-bridge/ バイパス等）にはこの結果をそのまま使用する。
+    表示・パターンマッチング目的には先頭 _RAW_INPUT_DISPLAY_LENGTH 文字に切り詰めて使用すること。
     """
     if raw_input is None:
         return ""
     if isinstance(raw_input, str):
         return raw_input
-    import json
-
     try:
         return json.dumps(raw_input, ensure_ascii=False)
     except (TypeError, ValueError):
         return str(raw_input)
 
 
-def _format_raw_input(raw_input: object) -> str:
-    """ToolCallUpdate.raw_input を文字列に変換する."""
-    if raw_input is None:
-        return ""
-    if isinstance(raw_input, str):
-        return raw_input[:500]
-    import json
-
-    try:
-        return json.dumps(raw_input, ensure_ascii=False)[:500]
-    except (TypeError, ValueError):
-        return str(raw_input)[:500]
-
-
 def _resolve_tool_kind(kind: str | None, title: str | None) -> str:
     """ツール呼び出しの kind を解決する.
 
@@ -1327,7 +1460,7 @@ def _resolve_tool_kind(kind: str | None, title: str | None) -> str:
         title: ツールタイトル（フォールバック用）
 
     Returns:
-        解決された kind 文字列（最低でも "unknown"）
+        解決された小文字の kind 文字列（最低でも "unknown"）
 
     Note:
         title から推測した kind（例: "write_file"）は、将来 ACP SDK が
@@ -1336,15 +1469,16 @@ def _resolve_tool_kind(kind: str | None, title: str | None) -> str:
         保存されるため、不一致が発生した場合はパターンの再登録が必要です。
     """
     if kind:
-        return kind
+        # 後段の判定（_is_write_operation など）で都度小文字化しないよう、ここで正規化する
+        return kind.lower()
     if title:
         # タイトルから推測する場合はコロン以降を捨て、[a-z0-9_]+ に正規化する
         # 例: "Bash: echo hello" → "bash"、"Write File" → "write_file"
         base = title.split(":", 1)[0].strip().lower()
         if not base:
             return "unknown"
-        normalized = re.sub(r"\s+", "_", base)
-        normalized = re.sub(r"[^a-z0-9_]", "", normalized)
+        normalized = _WHITESPACE_PATTERN.sub("_", base)
+        normalized = _NON_KIND_CHAR_PATTERN.sub("", normalized)
         return normalized or "unknown"
     return "unknown"
 
@@ -1359,3 +1493,24 @@ def _format_content_summary(content: object) -> str:
         if text and isinstance(text, str):
             parts.append(text[:200])
     return "\n".join(parts)[:500]
+
+
+def _select_default_allow_option(options: list[PermissionOption]) -> PermissionOption:
+    """ユーザーが承認のみを返した場合に使うパーミッションオプションを選択する.
+
+    allow_always を優先し、なければ最初の allow_once、どちらもなければ先頭のオプションを返す。
+    オプション一覧は1回だけ走査する。
+
+    Args:
+        options: 選択可能なパーミッションオプション（空でないこと）
+
+    Returns:
+        選択されたオプション
+    """
+    first_allow_once: PermissionOption | None = None
+    for option in options:
+        if option.kind == "allow_always":
+            return option
+        if option.kind == "allow_once" and first_allow_once is None:
+            first_allow_once = option
+    return first_allow_once or options[0]
@@ -46,6 +46,7 @@ class Config(BaseSettings):
     # パーミッション設定
     permission_timeout: float = Field(
         default=120.0,
+        ge=0,
         description="パーミッション要求のタイムアウト秒数（0で自動承認）",
     )
 
@@ -168,7 +168,7 @@ class PermissionView(discord.ui.View):
         self.stop()
 
     async def on_timeout(self) -> None:
-        """タイムアウト時の処理（Futureにはセットしない→SessionServiceのwait_forでTimeoutError）."""
+        """タイムアウト時の処理（Futureにはセットしない→SessionServiceのasyncio.timeoutでTimeoutError）."""
         logger.info(
             "Permission view timed out",
             session_id=self._request.session_id,
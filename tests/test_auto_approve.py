@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import json
+import os
+import stat
 from pathlib import Path  # noqa: TC003
 from typing import TYPE_CHECKING
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -150,6 +152,41 @@ class TestAutoApprovePatterns:
         data = json.loads(config_file.read_text(encoding="utf-8"))
         assert data == ["Fetch:*"]
 
+    def test_save_leaves_no_temporary_file(
+        self, project_service: ProjectService, project: Project
+    ) -> None:
+        """保存後に一時ファイルが残らない."""
+        project_service.add_auto_approve_pattern(project, "Fetch:*")
+        project_service.remove_auto_approve_pattern(project, "Fetch:*")
+
+        config_dir = Path(project.path) / ".acp-bridge"
+        assert sorted(p.name for p in config_dir.iterdir()) == ["auto_approve.json"]
+
+    def test_save_preserves_file_mode(
+        self, project_service: ProjectService, project: Project
+    ) -> None:
+        """保存しても既存ファイルのパーミッションが維持される."""
+        project_service.add_auto_approve_pattern(project, "Fetch:*")
+        path = Path(project.path) / ".acp-bridge" / "auto_approve.json"
+        path.chmod(0o640)
+
+        project_service.add_auto_approve_pattern(project, "Read:*")
+
+        assert stat.S_IMODE(path.stat().st_mode) == 0o640
+
+    def test_save_new_file_applies_umask(
+        self, project_service: ProjectService, project: Project
+    ) -> None:
+        """新規作成したファイルには umask が適用される."""
+        old_umask = os.umask(0o077)
+        try:
+            project_service.add_auto_approve_pattern(project, "Fetch:*")
+        finally:
+            os.umask(old_umask)
+
+        path = Path(project.path) / ".acp-bridge" / "auto_approve.json"
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
     def test_get_patterns_invalid_file(
         self, project_service: ProjectService, project: Project
     ) -> None:
@@ -162,6 +199,36 @@ class TestAutoApprovePatterns:
         patterns = project_service.get_auto_approve_patterns(project)
         assert patterns == []
 
+    def test_get_patterns_detects_external_change(
+        self, project_service: ProjectService, project: Project
+    ) -> None:
+        """キャッシュ後にファイルが外部で書き換えられた場合は再読み込みする."""
+        project_service.add_auto_approve_pattern(project, "Fetch:*")
+        assert project_service.get_auto_approve_patterns(project) == ["Fetch:*"]
+
+        config_file = Path(project.path) / ".acp-bridge" / "auto_approve.json"
+        config_file.write_text(
+            json.dumps(["Fetch:*", "Read:/safe/*"]), encoding="utf-8"
+        )
+        assert project_service.get_auto_approve_patterns(project) == [
+            "Fetch:*",
+            "Read:/safe/*",
+        ]
+
+        config_file.unlink()
+        assert project_service.get_auto_approve_patterns(project) == []
+
+    def test_get_patterns_returns_independent_lists(
+        self, project_service: ProjectService, project: Project
+    ) -> None:
+        """返されたリストを変更してもキャッシュに影響しない."""
+        project_service.add_auto_approve_pattern(project, "Fetch:*")
+
+        patterns = project_service.get_auto_approve_patterns(project)
+        patterns.append("Bash:*")
+
+        assert project_service.get_auto_approve_patterns(project) == ["Fetch:*"]
+
 
 class TestIsAutoApproved:
     """ProjectService.is_auto_approved のテスト."""
@@ -172,6 +239,28 @@ class TestIsAutoApproved:
         """パターンがない場合は自動承認しない."""
         assert project_service.is_auto_approved(project, "fetch", "") is None
 
+    def test_no_file_skips_trusted_path_check(
+        self, project_service: ProjectService, project: Project
+    ) -> None:
+        """設定ファイルがない場合は Trusted Path の検証を行わずに None を返す."""
+        with patch.object(project_service, "_is_path_trusted") as mock_trusted:
+            assert project_service.is_auto_approved(project, "fetch", "") is None
+        mock_trusted.assert_not_called()
+
+    def test_untrusted_project_not_approved(
+        self, project_service: ProjectService, tmp_path: Path
+    ) -> None:
+        """Trusted Path 外のプロジェクトは設定ファイルがあっても自動承認しない."""
+        outside_dir = tmp_path / "outside"
+        config_dir = outside_dir / ".acp-bridge"
+        config_dir.mkdir(parents=True)
+        (config_dir / "auto_approve.json").write_text(
+            json.dumps(["*:*"]), encoding="utf-8"
+        )
+        outside_project = Project(id=99, path=str(outside_dir))
+
+        assert project_service.is_auto_approved(outside_project, "fetch", "") is None
+
     def test_exact_kind_match(
         self, project_service: ProjectService, project: Project
     ) -> None:
@@ -103,3 +103,16 @@ def test_config_default_project_mode_invalid(monkeypatch: pytest.MonkeyPatch) ->
 
     with pytest.raises(ValidationError):
         Config()
+
+
+def test_config_permission_timeout_negative(monkeypatch: pytest.MonkeyPatch) -> None:
+    """負の permission_timeout が ValidationError を発生させることを確認する."""
+    from pydantic import ValidationError
+
+    monkeypatch.setenv("DISCORD_BOT_TOKEN", "test_token")
+    monkeypatch.setenv("DISCORD_GUILD_ID", "123456789")
+    monkeypatch.setenv("DISCORD_ALLOWED_USER_ID", "987654321")
+    monkeypatch.setenv("PERMISSION_TIMEOUT", "-1")
+
+    with pytest.raises(ValidationError):
+        Config()
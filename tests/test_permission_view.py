@@ -23,7 +23,7 @@ from discord_acp_bridge.presentation.views.permission import (
 def _make_request(
     raw_input: str = "echo hello",
     content_summary: str = "",
-    options: list[PermissionOptionInfo] | None = None,
+    options: tuple[PermissionOptionInfo, ...] | None = None,
 ) -> PermissionRequest:
     """テスト用のPermissionRequestを作成する."""
     return PermissionRequest(
@@ -38,14 +38,14 @@ def _make_request(
             content_summary=content_summary,
         ),
         options=options
-        or [
+        or (
             PermissionOptionInfo(
                 option_id="opt-1", name="Allow Once", kind="allow_once"
             ),
             PermissionOptionInfo(
                 option_id="opt-2", name="Allow Always", kind="allow_always"
             ),
-        ],
+        ),
     )
 
 
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import dataclasses
+import os
 from pathlib import Path  # noqa: TC003
 
 import pytest
@@ -110,6 +112,28 @@ class TestProjectService:
         assert len(projects) == 1
         assert projects[0].path == str(temp_trusted_root / "visible_project")
 
+    def test_list_projects_skips_symlink_outside_trusted(
+        self,
+        tmp_path: Path,
+        temp_trusted_root: Path,
+    ) -> None:
+        """Trusted Path外を指すシンボリックリンクが除外されることを確認する."""
+        (temp_trusted_root / "real_project").mkdir()
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        (temp_trusted_root / "escape").symlink_to(outside, target_is_directory=True)
+
+        config = Config(
+            discord_bot_token="test_token",
+            discord_guild_id=123456789,
+            discord_allowed_user_id=987654321,
+            trusted_paths=[str(temp_trusted_root)],
+        )
+        service = ProjectService(config)
+        projects = service.list_projects()
+
+        assert [p.path for p in projects] == [str(temp_trusted_root / "real_project")]
+
     def test_list_projects_nonexistent_trusted_path(
         self,
         tmp_path: Path,
@@ -127,6 +151,34 @@ class TestProjectService:
         # 警告ログが出力されるが、空のリストが返る
         assert projects == []
 
+    def test_list_projects_detects_new_directory(
+        self,
+        config_with_trusted_paths: Config,
+        temp_trusted_root: Path,
+        temp_project_dirs: list[Path],
+    ) -> None:
+        """キャッシュ後に追加されたディレクトリが一覧に反映されることを確認する."""
+        service = ProjectService(config_with_trusted_paths)
+        assert len(service.list_projects()) == 3
+
+        (temp_trusted_root / "project4").mkdir()
+        projects = service.list_projects()
+
+        assert len(projects) == 4
+        assert projects[-1].path == str(temp_trusted_root / "project4")
+
+    def test_list_projects_returns_independent_lists(
+        self,
+        config_with_trusted_paths: Config,
+        temp_project_dirs: list[Path],
+    ) -> None:
+        """キャッシュされた一覧を呼び出し側が変更しても影響しないことを確認する."""
+        service = ProjectService(config_with_trusted_paths)
+        projects = service.list_projects()
+        projects.clear()
+
+        assert len(service.list_projects()) == 3
+
     def test_get_project_by_id_success(
         self,
         config_with_trusted_paths: Config,
@@ -152,6 +204,88 @@ class TestProjectService:
         assert exc_info.value.project_id == 999
         assert "Project #999 not found" in str(exc_info.value)
 
+    @pytest.mark.parametrize("project_id", [0, -1, 4])
+    def test_get_project_by_id_out_of_range(
+        self,
+        config_with_trusted_paths: Config,
+        temp_project_dirs: list[Path],
+        project_id: int,
+    ) -> None:
+        """範囲外のIDを指定した場合にProjectNotFoundErrorになることを確認する."""
+        service = ProjectService(config_with_trusted_paths)
+
+        with pytest.raises(ProjectNotFoundError):
+            service.get_project_by_id(project_id)
+
+    def test_get_project_by_id_rejects_directory_replaced_by_symlink(
+        self,
+        config_with_trusted_paths: Config,
+        temp_trusted_root: Path,
+        tmp_path: Path,
+    ) -> None:
+        """キャッシュ後にTrusted Path外へのシンボリックリンクに差し替えられたプロジェクトが拒否されることを確認する."""
+        project_dir = temp_trusted_root / "project"
+        project_dir.mkdir()
+        service = ProjectService(config_with_trusted_paths)
+        assert service.get_project_by_id(1).path == str(project_dir)
+
+        # ディレクトリを差し替えたうえで、Trusted Path の mtime を元に戻す
+        # （mtime の粒度が粗いファイルシステムでも同じ状況になる）
+        root_stat = os.stat(temp_trusted_root)
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        project_dir.rmdir()
+        project_dir.symlink_to(outside, target_is_directory=True)
+        os.utime(temp_trusted_root, ns=(root_stat.st_atime_ns, root_stat.st_mtime_ns))
+
+        with pytest.raises(ValueError, match="not within trusted paths"):
+            service.get_project_by_id(1)
+
+    def test_list_projects_multiple_trusted_paths(
+        self,
+        tmp_path: Path,
+    ) -> None:
+        """複数のTrusted Pathsのスキャン結果が1つのソート済み一覧にまとまることを確認する."""
+        trusted1 = tmp_path / "trusted1"
+        trusted2 = tmp_path / "trusted2"
+        (trusted1 / "beta").mkdir(parents=True)
+        (trusted2 / "alpha").mkdir(parents=True)
+        (trusted1 / "gamma").mkdir()
+
+        config = Config(
+            discord_bot_token="test_token",
+            discord_guild_id=123456789,
+            discord_allowed_user_id=987654321,
+            trusted_paths=[str(trusted2), str(tmp_path / "missing"), str(trusted1)],
+        )
+        service = ProjectService(config)
+        projects = service.list_projects()
+
+        assert [p.path for p in projects] == [
+            str(trusted1 / "beta"),
+            str(trusted1 / "gamma"),
+            str(trusted2 / "alpha"),
+        ]
+
+    def test_invalidate_trusted_cache_applies_new_trusted_paths(
+        self,
+        config_with_trusted_paths: Config,
+        temp_project_dirs: list[Path],
+        tmp_path: Path,
+    ) -> None:
+        """trusted_paths 変更後に invalidate_trusted_cache で反映されることを確認する."""
+        other_root = tmp_path / "other"
+        (other_root / "other_project").mkdir(parents=True)
+        service = ProjectService(config_with_trusted_paths)
+        assert len(service.list_projects()) == 3
+        assert service._is_path_trusted(other_root / "other_project") is False
+
+        config_with_trusted_paths.trusted_paths.append(str(other_root))
+        service.invalidate_trusted_cache()
+
+        assert service._is_path_trusted(other_root / "other_project") is True
+        assert len(service.list_projects()) == 4
+
     def test_is_path_trusted_valid(
         self,
         config_with_trusted_paths: Config,
@@ -202,6 +336,56 @@ class TestProjectService:
         untrusted = tmp_path / "untrusted"
         assert service._is_path_trusted(untrusted / "project") is False
 
+    def test_is_path_trusted_root_itself(
+        self,
+        config_with_trusted_paths: Config,
+        temp_trusted_root: Path,
+    ) -> None:
+        """Trusted Path自身が配下として扱われることを確認する."""
+        service = ProjectService(config_with_trusted_paths)
+        assert service._is_path_trusted(temp_trusted_root) is True
+
+    def test_is_path_trusted_sibling_with_same_prefix(
+        self,
+        config_with_trusted_paths: Config,
+        temp_trusted_root: Path,
+    ) -> None:
+        """名前の前方が一致するだけの兄弟ディレクトリが拒否されることを確認する."""
+        service = ProjectService(config_with_trusted_paths)
+
+        # 例: /tmp/trusted に対する /tmp/trusted_evil
+        sibling = temp_trusted_root.parent / f"{temp_trusted_root.name}_evil"
+        assert service._is_path_trusted(sibling) is False
+        assert service._is_path_trusted(sibling / "project") is False
+
+    def test_is_path_trusted_parent_traversal(
+        self,
+        config_with_trusted_paths: Config,
+        temp_trusted_root: Path,
+    ) -> None:
+        """`..` を含むパスが正規化後に判定されることを確認する."""
+        service = ProjectService(config_with_trusted_paths)
+        assert service._is_path_trusted(temp_trusted_root / ".." / "escape") is False
+
+    def test_is_path_trusted_reevaluates_replaced_symlink(
+        self,
+        config_with_trusted_paths: Config,
+        temp_trusted_root: Path,
+        tmp_path: Path,
+    ) -> None:
+        """同じパスがTrusted Path外へのシンボリックリンクに差し替えられた場合に拒否されることを確認する."""
+        service = ProjectService(config_with_trusted_paths)
+        project_dir = temp_trusted_root / "project"
+        project_dir.mkdir()
+        assert service._is_path_trusted(project_dir) is True
+
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        project_dir.rmdir()
+        project_dir.symlink_to(outside, target_is_directory=True)
+
+        assert service._is_path_trusted(project_dir) is False
+
 
 class TestProject:
     """Projectモデルのテスト."""
@@ -212,6 +396,12 @@ class TestProject:
         assert project.id == 1
         assert project.path == "/path/to/project"
 
+    def test_project_is_immutable(self) -> None:
+        """Projectインスタンスが変更不可であることを確認する."""
+        project = Project(id=1, path="/path/to/project")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            project.id = 2  # type: ignore[misc]
+
 
 class TestProjectNotFoundError:
     """ProjectNotFoundErrorのテスト."""
@@ -253,6 +443,39 @@ class TestCreateProject:
         assert project.id == 1
         assert project.path == str(temp_trusted_root / "aaa_project")
 
+    def test_create_project_updates_cached_list(
+        self,
+        config_with_trusted_paths: Config,
+        temp_trusted_root: Path,
+        temp_project_dirs: list[Path],
+    ) -> None:
+        """キャッシュ済みの一覧に作成したプロジェクトが反映されることを確認する."""
+        service = ProjectService(config_with_trusted_paths)
+        service.list_projects()
+
+        project = service.create_project("project2a")
+        projects = service.list_projects()
+
+        assert project.id == 3
+        assert [p.id for p in projects] == [1, 2, 3, 4]
+        assert projects[2].path == str(temp_trusted_root / "project2a")
+        assert service.get_project_by_id(project.id).path == project.path
+
+    def test_create_project_fails_when_rescan_misses_new_directory(
+        self,
+        config_with_trusted_paths: Config,
+        temp_project_dirs: list[Path],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """再スキャンで作成したディレクトリが見つからない場合に別プロジェクトのIDを返さないことを確認する."""
+        service = ProjectService(config_with_trusted_paths)
+        monkeypatch.setattr(
+            service, "_scan_project_paths", lambda: [str(d) for d in temp_project_dirs]
+        )
+
+        with pytest.raises(ProjectCreationError, match="見つかりません"):
+            service.create_project("aaa_project")
+
     def test_create_project_strips_whitespace(
         self,
         config_with_trusted_paths: Config,
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime
 from pathlib import Path  # noqa: TC003
 from typing import TYPE_CHECKING
@@ -409,6 +410,73 @@ class TestSessionService:
         with pytest.raises(SessionNotFoundError, match="invalid_session_id"):
             await service.kill_session("invalid_session_id")
 
+    @pytest.mark.asyncio
+    async def test_session_update_routed_by_acp_session_id(
+        self,
+        config: Config,
+        project: Project,
+        mock_acp_client: MagicMock,
+    ) -> None:
+        """session_update 通知が ACP セッションIDに対応するセッションに反映されるテスト."""
+        from discord_acp_bridge.infrastructure.acp_client import UsageUpdate
+
+        instance = mock_acp_client.return_value
+        instance.initialize = AsyncMock(side_effect=["acp_1", "acp_2"])
+        service = SessionService(config)
+        session1 = await service.create_session(user_id=123, project=project)
+        session2 = await service.create_session(user_id=789, project=project)
+
+        service._on_session_update("acp_2", UsageUpdate(used=10, size=100))
+
+        assert session2.context_used == 10
+        assert session1.context_used is None
+
+    @pytest.mark.asyncio
+    async def test_session_update_ignored_after_close(
+        self,
+        config: Config,
+        project: Project,
+        mock_acp_client: MagicMock,
+    ) -> None:
+        """終了済みセッションの session_update 通知は無視されるテスト."""
+        from discord_acp_bridge.infrastructure.acp_client import UsageUpdate
+
+        service = SessionService(config)
+        session = await service.create_session(user_id=123, project=project)
+        await service.close_session(session.id)
+
+        service._on_session_update(
+            "test_acp_session_id", UsageUpdate(used=10, size=100)
+        )
+        service._on_session_update("unknown_acp_id", UsageUpdate(used=10, size=100))
+
+        assert session.context_used is None
+
+    @pytest.mark.asyncio
+    async def test_timeout_flushes_buffer_before_notifying(
+        self,
+        config: Config,
+        project: Project,
+        mock_acp_client: MagicMock,
+    ) -> None:
+        """タイムアウト時はバッファを送信してからタイムアウト通知を送るテスト."""
+        calls: list[str] = []
+        on_message = AsyncMock(side_effect=lambda *_: calls.append("message"))
+        on_timeout = AsyncMock(side_effect=lambda *_: calls.append("timeout"))
+        service = SessionService(config, on_message=on_message, on_timeout=on_timeout)
+        session = await service.create_session(
+            user_id=123, project=project, thread_id=456
+        )
+        service._append_to_message_buffer(456, "partial")
+
+        service._on_timeout("test_acp_session_id")
+        await asyncio.sleep(0.01)
+
+        assert calls == ["message", "timeout"]
+        on_timeout.assert_awaited_once_with(456)
+        assert session.state == SessionState.CLOSED
+        assert service.get_session_by_thread(thread_id=456) is None
+
 
 class TestSessionNotFoundError:
     """SessionNotFoundErrorのテスト."""
@@ -577,6 +645,94 @@ class TestSessionModelFeatures:
             await service.set_model(session.id, "claude-opus-4-6")
 
 
+class TestMessageBuffering:
+    """メッセージバッファリングのテスト."""
+
+    @pytest.mark.asyncio
+    async def test_buffered_chunks_flushed_once(self, config: Config) -> None:
+        """連続したチャンクは結合されて1回だけ送信されるテスト."""
+        on_message = AsyncMock()
+        service = SessionService(config, on_message=on_message)
+
+        service._append_to_message_buffer(456, "Hello, ")
+        service._append_to_message_buffer(456, "world")
+        first_task = service._flush_tasks[456]
+        # 待機中のタスクは再作成されない
+        service._append_to_message_buffer(456, "!")
+        assert service._flush_tasks[456] is first_task
+
+        # 予定時刻を早めてフラッシュさせる
+        service._schedule_buffer_flush(456, delay=0)
+        await asyncio.sleep(0.01)
+
+        on_message.assert_awaited_once_with(456, "Hello, world!")
+        assert 456 not in service._flush_tasks
+
+    @pytest.mark.asyncio
+    async def test_large_buffer_flushed_immediately(self, config: Config) -> None:
+        """バッファが閾値を超えた場合は遅延を待たずに送信されるテスト."""
+        on_message = AsyncMock()
+        service = SessionService(config, on_message=on_message)
+
+        service._append_to_message_buffer(456, "a" * 1000)
+        service._append_to_message_buffer(456, "b" * 1000)
+        await asyncio.sleep(0.01)
+
+        on_message.assert_awaited_once_with(456, "a" * 1000 + "b" * 1000)
+
+
+class TestTypingIndicator:
+    """タイピングインジケーターのテスト."""
+
+    @pytest.mark.asyncio
+    async def test_typing_shares_single_heartbeat_task(self, config: Config) -> None:
+        """複数スレッドのタイピング再送が1つのタスクで行われるテスト."""
+        on_typing = AsyncMock()
+        service = SessionService(config, on_typing=on_typing)
+
+        await service.start_typing_for_thread(456)
+        heartbeat = service._typing_heartbeat_task
+        await service.start_typing_for_thread(789)
+        await asyncio.sleep(0.01)
+
+        assert service._typing_heartbeat_task is heartbeat
+        on_typing.assert_any_await(456, True)
+        on_typing.assert_any_await(789, True)
+
+        await service.stop_typing_for_thread(456)
+        assert service._typing_heartbeat_task is heartbeat
+        await service.stop_typing_for_thread(789)
+
+        on_typing.assert_any_await(456, False)
+        on_typing.assert_any_await(789, False)
+        assert service._typing_heartbeat_task is None
+        assert service._typing_active == {}
+
+    @pytest.mark.asyncio
+    async def test_schedule_typing_stop_reuses_pending_task(
+        self, config: Config
+    ) -> None:
+        """update 受信毎に停止タスクを作り直さず、最後の update から遅延後に停止するテスト."""
+        on_typing = AsyncMock()
+        service = SessionService(config, on_typing=on_typing)
+        await service.start_typing_for_thread(456)
+
+        service._schedule_typing_stop(456, delay=0.05)
+        stop_task = service._typing_stop_tasks[456]
+        await asyncio.sleep(0.03)
+        service._schedule_typing_stop(456, delay=0.05)
+        assert service._typing_stop_tasks[456] is stop_task
+
+        # 最初のスケジュールからは遅延時間が経過しているが、まだ停止しない
+        await asyncio.sleep(0.03)
+        assert service._typing_active.get(456) is True
+
+        await stop_task
+        on_typing.assert_any_await(456, False)
+        assert 456 not in service._typing_active
+        assert 456 not in service._typing_stop_tasks
+
+
 class TestPermissionHandling:
     """パーミッション処理のテスト."""
 
@@ -905,6 +1061,10 @@ class TestResolveToolKind:
         """kind が設定されている場合はそのまま返す."""
         assert _resolve_tool_kind("bash", "Bash: echo hello") == "bash"
 
+    def test_kind_present_is_lowercased(self) -> None:
+        """kind が大文字を含む場合は小文字に正規化する."""
+        assert _resolve_tool_kind("Edit", None) == "edit"
+
     def test_kind_none_infers_from_title(self) -> None:
         """kind が None の場合は title から推測する（スペース→アンダースコア、小文字化）."""
         assert _resolve_tool_kind(None, "Write File") == "write_file"